@@ -1,9 +1,10 @@
 import sys
-import json
 import asyncio
+import logging
 import argparse
 import secrets
-from typing import Optional, Dict, Awaitable, Any, TypeVar
+import itertools
+from typing import Optional, Dict, Union
 from asyncio.futures import Future
 
 from pymediasoup import Device
@@ -22,13 +23,33 @@ from aiortc.contrib.media import MediaPlayer, MediaBlackhole, MediaRecorder
 
 # Implement simple protoo client
 import websockets
-from random import random
 
-T = TypeVar("T")
+# Prefer orjson for protoo frames, fall back to the stdlib json
+try:
+    import orjson
+
+    def dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    loads = orjson.loads
+except ImportError:
+    from json import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+# Pre-serialize a request whose data never changes, only the id is filled in
+# per call with `template % reqId`.
+def requestTemplate(method: str, data: dict) -> str:
+    body = dumps(data).replace("%", "%%")
+    return f'{{"request":true,"id":%d,"method":"{method}","data":{body}}}'
+
+
+GET_ROUTER_RTP_CAPABILITIES = requestTemplate("getRouterRtpCapabilities", {})
 
 
 class Demo:
-    def __init__(self, uri, player=None, recorder=MediaBlackhole(), loop=None):
+    def __init__(self, uri, player=None, recorder=None, loop=None):
         if not loop:
             if sys.version_info.major == 3 and sys.version_info.minor == 6:
                 loop = asyncio.get_event_loop()
@@ -37,11 +58,19 @@ class Demo:
         self._loop = loop
         self._uri = uri
         self._player = player
-        self._recorder = recorder
+        self._recorder = recorder if recorder is not None else MediaBlackhole()
         # Save answers temporarily
         self._answers: Dict[str, Future] = {}
+        # Request ids only need to be unique within the session
+        self._nextRequestId = itertools.count(1).__next__
         self._websocket = None
         self._device = None
+        # Device capabilities as plain dicts, fixed once the device is loaded
+        self._rtpCapabilities: Optional[dict] = None
+        self._sctpCapabilities: Optional[dict] = None
+        # Request templates depending on device capabilities, built on load
+        self._joinTemplate: Optional[str] = None
+        self._createWebRtcTransportTemplates: Dict[bool, str] = {}
 
         self._tracks = []
 
@@ -63,74 +92,106 @@ class Demo:
         self._sendTransport: Optional[Transport] = None
         self._recvTransport: Optional[Transport] = None
 
-        self._producers = []
-        self._consumers = []
+        # (Data)Producers and (Data)Consumers indexed by id
+        self._producers: Dict[str, Union[Producer, DataProducer]] = {}
+        self._consumers: Dict[str, Union[Consumer, DataConsumer]] = {}
         self._tasks = []
         self._closed = False
+        # Set by close() to stop background loops right away
+        self._stopEvent = asyncio.Event()
 
     # websocket receive task
     async def recv_msg_task(self):
-        while True:
-            await asyncio.sleep(0.5)
-            if self._websocket is not None:
-                message = json.loads(await self._websocket.recv())
-                if message.get("response"):
-                    if message.get("id") is not None:
-                        self._answers[message.get("id")].set_result(message)
-                elif message.get("request"):
-                    if message.get("method") == "newConsumer":
-                        await self.consume(
-                            id=message["data"]["id"],
-                            producerId=message["data"]["producerId"],
-                            kind=message["data"]["kind"],
-                            rtpParameters=message["data"]["rtpParameters"],
-                        )
-                        response = {
-                            "response": True,
-                            "id": message["id"],
-                            "ok": True,
-                            "data": {},
-                        }
-                        await self._websocket.send(json.dumps(response))
-                    elif message.get("method") == "newDataConsumer":
-                        await self.consumeData(
-                            id=message["data"]["id"],
-                            dataProducerId=message["data"]["dataProducerId"],
-                            label=message["data"]["label"],
-                            protocol=message["data"]["protocol"],
-                            sctpStreamParameters=message["data"][
-                                "sctpStreamParameters"
-                            ],
-                        )
-                        response = {
-                            "response": True,
-                            "id": message["data"]["id"],
-                            "ok": True,
-                            "data": {},
-                        }
-                        await self._websocket.send(json.dumps(response))
-                elif message.get("notification"):
-                    print(message)
-
-    # wait for answer ready
-    async def _wait_for(
-        self, fut: Awaitable[T], timeout: Optional[float], **kwargs: Any
-    ) -> T:
-        try:
-            return await asyncio.wait_for(fut, timeout=timeout, **kwargs)
-        except asyncio.TimeoutError:
-            raise Exception("Operation timed out")
-
-    async def _send_request(self, request):
-        self._answers[request["id"]] = self._loop.create_future()
-        await self._websocket.send(json.dumps(request))
-
-    # Generates a random positive integer.
+        # Wait on the socket itself instead of polling it on a timer.
+        async for raw in self._websocket:
+            # A bad message must not stop the task, or every pending request
+            # would hang until its timeout.
+            try:
+                await self._handle_message(loads(raw))
+            except Exception:
+                logging.exception("failed to handle protoo message")
+
+    async def _handle_message(self, message: dict):
+        if message.get("response"):
+            fut = self._answers.pop(message.get("id"), None)
+            if fut is None or fut.done():
+                return
+            if message.get("ok"):
+                fut.set_result(message)
+            else:
+                fut.set_exception(
+                    Exception(
+                        f"request failed: [{message.get('errorCode')}] "
+                        f"{message.get('errorReason')}"
+                    )
+                )
+        elif message.get("request"):
+            if message.get("method") == "newConsumer":
+                await self.consume(
+                    id=message["data"]["id"],
+                    producerId=message["data"]["producerId"],
+                    kind=message["data"]["kind"],
+                    rtpParameters=message["data"]["rtpParameters"],
+                )
+                response = {
+                    "response": True,
+                    "id": message["id"],
+                    "ok": True,
+                    "data": {},
+                }
+                await self._websocket.send(dumps(response))
+            elif message.get("method") == "newDataConsumer":
+                await self.consumeData(
+                    id=message["data"]["id"],
+                    dataProducerId=message["data"]["dataProducerId"],
+                    label=message["data"]["label"],
+                    protocol=message["data"]["protocol"],
+                    sctpStreamParameters=message["data"]["sctpStreamParameters"],
+                )
+                response = {
+                    "response": True,
+                    "id": message["data"]["id"],
+                    "ok": True,
+                    "data": {},
+                }
+                await self._websocket.send(dumps(response))
+        elif message.get("notification"):
+            print(message)
+
+    async def _send_request(self, request) -> Future:
+        return await self._send_encoded(request["id"], dumps(request))
+
+    # Send an already serialized request, returns its answer future
+    async def _send_encoded(self, reqId, frame: str) -> Future:
+        fut = self._answers[reqId] = self._loop.create_future()
+        await self._websocket.send(frame)
+        return fut
+
+    # Send independent (reqId, frame) requests together, returns one answer
+    # future per request
+    async def _send_many(self, requests):
+        futs = []
+        for reqId, _ in requests:
+            fut = self._loop.create_future()
+            self._answers[reqId] = fut
+            futs.append(fut)
+        await asyncio.gather(*(self._websocket.send(frame) for _, frame in requests))
+        return futs
+
+    # Generates a unique positive integer.
     def generateRandomNumber(self) -> int:
-        return round(random() * 10000000)
+        return self._nextRequestId()
 
     async def run(self):
-        self._websocket = await websockets.connect(uri, subprotocols=["protoo"])
+        # protoo frames carry large, repetitive JSON (capabilities, RTP
+        # parameters), so keep permessage-deflate on and allow big frames.
+        self._websocket = await websockets.connect(
+            self._uri,
+            subprotocols=["protoo"],
+            compression="deflate",
+            max_size=2**22,
+            write_limit=2**20,
+        )
         if sys.version_info < (3, 7):
             task_run_recv_msg = asyncio.ensure_future(self.recv_msg_task())
         else:
@@ -138,8 +199,7 @@ class Demo:
         self._tasks.append(task_run_recv_msg)
 
         await self.load()
-        await self.createSendTransport()
-        await self.createRecvTransport()
+        await self.createTransports()
         await self.produce()
 
         await task_run_recv_msg
@@ -152,61 +212,92 @@ class Demo:
 
         # Get Router RtpCapabilities
         reqId = self.generateRandomNumber()
-        req = {
-            "request": True,
-            "id": reqId,
-            "method": "getRouterRtpCapabilities",
-            "data": {},
-        }
-        await self._send_request(req)
-        ans = await self._wait_for(self._answers[reqId], timeout=15)
+        fut = await self._send_encoded(reqId, GET_ROUTER_RTP_CAPABILITIES % reqId)
+        ans = await asyncio.wait_for(fut, timeout=15)
 
         # Load Router RtpCapabilities
         await self._device.load(ans["data"])
+        self._rtpCapabilities = self._device.rtpCapabilities.dict(exclude_none=True)
+        self._sctpCapabilities = self._device.sctpCapabilities.dict(exclude_none=True)
+
+        self._joinTemplate = requestTemplate(
+            "join",
+            {
+                "displayName": "pymediasoup",
+                "device": {"flag": "python", "name": "python", "version": "0.1.0"},
+                "rtpCapabilities": self._rtpCapabilities,
+                "sctpCapabilities": self._sctpCapabilities,
+            },
+        )
+        for producing in (True, False):
+            self._createWebRtcTransportTemplates[producing] = requestTemplate(
+                "createWebRtcTransport",
+                {
+                    "forceTcp": False,
+                    "producing": producing,
+                    "consuming": not producing,
+                    "sctpCapabilities": self._sctpCapabilities,
+                },
+            )
+
+    def _createWebRtcTransportRequest(self, producing: bool):
+        reqId = self.generateRandomNumber()
+        return reqId, self._createWebRtcTransportTemplates[producing] % reqId
+
+    # Create send and recv transports with their requests sent concurrently
+    async def createTransports(self):
+        if self._sendTransport is not None or self._recvTransport is not None:
+            await self.createSendTransport()
+            await self.createRecvTransport()
+            return
+        futs = await self._send_many(
+            [
+                self._createWebRtcTransportRequest(producing=True),
+                self._createWebRtcTransportRequest(producing=False),
+            ]
+        )
+        sendAns, recvAns = await asyncio.wait_for(asyncio.gather(*futs), timeout=15)
+        self._setupSendTransport(sendAns["data"])
+        self._setupRecvTransport(recvAns["data"])
 
     async def createSendTransport(self):
         if self._sendTransport is not None:
             return
         # Send create sendTransport request
+        reqId, frame = self._createWebRtcTransportRequest(producing=True)
+        fut = await self._send_encoded(reqId, frame)
+        ans = await asyncio.wait_for(fut, timeout=15)
+        self._setupSendTransport(ans["data"])
+
+    # Shared "connect" handler, dtlsParameters are serialized once per transport
+    async def _connectTransport(self, transport: Transport, dtlsParameters):
         reqId = self.generateRandomNumber()
         req = {
             "request": True,
             "id": reqId,
-            "method": "createWebRtcTransport",
+            "method": "connectWebRtcTransport",
             "data": {
-                "forceTcp": False,
-                "producing": True,
-                "consuming": False,
-                "sctpCapabilities": self._device.sctpCapabilities.dict(),
+                "transportId": transport.id,
+                "dtlsParameters": dtlsParameters.dict(exclude_none=True),
             },
         }
-        await self._send_request(req)
-        ans = await self._wait_for(self._answers[reqId], timeout=15)
+        fut = await self._send_request(req)
+        ans = await asyncio.wait_for(fut, timeout=15)
+        print(ans)
 
+    def _setupSendTransport(self, data: dict):
         # Create sendTransport
         self._sendTransport = self._device.createSendTransport(
-            id=ans["data"]["id"],
-            iceParameters=ans["data"]["iceParameters"],
-            iceCandidates=ans["data"]["iceCandidates"],
-            dtlsParameters=ans["data"]["dtlsParameters"],
-            sctpParameters=ans["data"]["sctpParameters"],
+            id=data["id"],
+            iceParameters=data["iceParameters"],
+            iceCandidates=data["iceCandidates"],
+            dtlsParameters=data["dtlsParameters"],
+            sctpParameters=data["sctpParameters"],
         )
 
         @self._sendTransport.on("connect")
         async def on_connect(dtlsParameters):
-            reqId = self.generateRandomNumber()
-            req = {
-                "request": True,
-                "id": reqId,
-                "method": "connectWebRtcTransport",
-                "data": {
-                    "transportId": self._sendTransport.id,
-                    "dtlsParameters": dtlsParameters.dict(exclude_none=True),
-                },
-            }
-            await self._send_request(req)
-            ans = await self._wait_for(self._answers[reqId], timeout=15)
-            print(ans)
+            await self._connectTransport(self._sendTransport, dtlsParameters)
 
         @self._sendTransport.on("produce")
         async def on_produce(kind: str, rtpParameters, appData: dict):
@@ -222,8 +313,8 @@ class Demo:
                     "appData": appData,
                 },
             }
-            await self._send_request(req)
-            ans = await self._wait_for(self._answers[reqId], timeout=15)
+            fut = await self._send_request(req)
+            ans = await asyncio.wait_for(fut, timeout=15)
             return ans["data"]["id"]
 
         @self._sendTransport.on("producedata")
@@ -249,8 +340,8 @@ class Demo:
                     "appData": appData,
                 },
             }
-            await self._send_request(req)
-            ans = await self._wait_for(self._answers[reqId], timeout=15)
+            fut = await self._send_request(req)
+            ans = await asyncio.wait_for(fut, timeout=15)
             return ans["data"]["id"]
 
     async def produce(self):
@@ -259,32 +350,19 @@ class Demo:
 
         # Join room
         reqId = self.generateRandomNumber()
-        req = {
-            "request": True,
-            "id": reqId,
-            "method": "join",
-            "data": {
-                "displayName": "pymediasoup",
-                "device": {"flag": "python", "name": "python", "version": "0.1.0"},
-                "rtpCapabilities": self._device.rtpCapabilities.dict(exclude_none=True),
-                "sctpCapabilities": self._device.sctpCapabilities.dict(
-                    exclude_none=True
-                ),
-            },
-        }
-        await self._send_request(req)
-        ans = await self._wait_for(self._answers[reqId], timeout=15)
+        fut = await self._send_encoded(reqId, self._joinTemplate % reqId)
+        ans = await asyncio.wait_for(fut, timeout=15)
         print(ans)
 
         # produce
         videoProducer: Producer = await self._sendTransport.produce(
             track=self._videoTrack, stopTracks=False, appData={}
         )
-        self._producers.append(videoProducer)
+        self._addProducer(videoProducer)
         audioProducer: Producer = await self._sendTransport.produce(
             track=self._audioTrack, stopTracks=False, appData={}
         )
-        self._producers.append(audioProducer)
+        self._addProducer(audioProducer)
 
         # produce data
         await self.produceData()
@@ -300,54 +378,40 @@ class Demo:
             protocol="",
             appData={"info": "my-chat-DataProducer"},
         )
-        self._producers.append(dataProducer)
+        self._addProducer(dataProducer)
+        # Build the payload once and re-send it. It stays a str: the demo chat
+        # expects text messages, bytes would arrive as binary.
+        message = "hello"
         while not self._closed:
-            await asyncio.sleep(1)
-            dataProducer.send("hello")
+            try:
+                await asyncio.wait_for(self._stopEvent.wait(), timeout=1)
+            except asyncio.TimeoutError:
+                dataProducer.send(message)
+            else:
+                break
 
     async def createRecvTransport(self):
         if self._recvTransport is not None:
             return
         # Send create recvTransport request
-        reqId = self.generateRandomNumber()
-        req = {
-            "request": True,
-            "id": reqId,
-            "method": "createWebRtcTransport",
-            "data": {
-                "forceTcp": False,
-                "producing": False,
-                "consuming": True,
-                "sctpCapabilities": self._device.sctpCapabilities.dict(),
-            },
-        }
-        await self._send_request(req)
-        ans = await self._wait_for(self._answers[reqId], timeout=15)
+        reqId, frame = self._createWebRtcTransportRequest(producing=False)
+        fut = await self._send_encoded(reqId, frame)
+        ans = await asyncio.wait_for(fut, timeout=15)
+        self._setupRecvTransport(ans["data"])
 
+    def _setupRecvTransport(self, data: dict):
         # Create recvTransport
         self._recvTransport = self._device.createRecvTransport(
-            id=ans["data"]["id"],
-            iceParameters=ans["data"]["iceParameters"],
-            iceCandidates=ans["data"]["iceCandidates"],
-            dtlsParameters=ans["data"]["dtlsParameters"],
-            sctpParameters=ans["data"]["sctpParameters"],
+            id=data["id"],
+            iceParameters=data["iceParameters"],
+            iceCandidates=data["iceCandidates"],
+            dtlsParameters=data["dtlsParameters"],
+            sctpParameters=data["sctpParameters"],
         )
 
         @self._recvTransport.on("connect")
         async def on_connect(dtlsParameters):
-            reqId = self.generateRandomNumber()
-            req = {
-                "request": True,
-                "id": reqId,
-                "method": "connectWebRtcTransport",
-                "data": {
-                    "transportId": self._recvTransport.id,
-                    "dtlsParameters": dtlsParameters.dict(exclude_none=True),
-                },
-            }
-            await self._send_request(req)
-            ans = await self._wait_for(self._answers[reqId], timeout=15)
-            print(ans)
+            await self._connectTransport(self._recvTransport, dtlsParameters)
 
     async def consume(self, id, producerId, kind, rtpParameters):
         if self._recvTransport is None:
@@ -355,7 +419,7 @@ class Demo:
         consumer: Consumer = await self._recvTransport.consume(
             id=id, producerId=producerId, kind=kind, rtpParameters=rtpParameters
         )
-        self._consumers.append(consumer)
+        self._addConsumer(consumer)
         self._recorder.addTrack(consumer.track)
         await self._recorder.start()
 
@@ -377,23 +441,47 @@ class Demo:
             protocol=protocol,
             appData=appData,
         )
-        self._consumers.append(dataConsumer)
+        self._addConsumer(dataConsumer)
 
         @dataConsumer.on("message")
         def on_message(message):
             print(f"DataChannel {label}-{protocol}: {message}")
 
+    # Track a (Data)Producer until it closes
+    def _addProducer(self, producer):
+        self._producers[producer.id] = producer
+        producer.observer.on("close", lambda: self._producers.pop(producer.id, None))
+
+    # Track a (Data)Consumer until it closes
+    def _addConsumer(self, consumer):
+        self._consumers[consumer.id] = consumer
+        consumer.observer.on("close", lambda: self._consumers.pop(consumer.id, None))
+
     async def close(self):
-        for consumer in self._consumers:
-            await consumer.close()
-        for producer in self._producers:
-            await producer.close()
+        self._closed = True
+        self._stopEvent.set()
+        # Closing pops entries from the maps, so take the coroutines first.
+        results = await asyncio.gather(
+            *[consumer.close() for consumer in self._consumers.values()],
+            return_exceptions=True,
+        )
+        results += await asyncio.gather(
+            *[producer.close() for producer in self._producers.values()],
+            return_exceptions=True,
+        )
         for task in self._tasks:
             task.cancel()
-        if self._sendTransport:
-            await self._sendTransport.close()
-        if self._recvTransport:
-            await self._recvTransport.close()
+        results += await asyncio.gather(
+            *[
+                transport.close()
+                for transport in (self._sendTransport, self._recvTransport)
+                if transport
+            ],
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("close failed: %r", result)
         await self._recorder.stop()
 
 
@@ -421,7 +509,13 @@ if __name__ == "__main__":
     else:
         recorder = MediaBlackhole()
 
-    # run event loop
+    # run event loop, on uvloop when it is installed
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     loop = asyncio.get_event_loop()
     try:
         demo = Demo(uri=uri, player=player, recorder=recorder, loop=loop)
@@ -35,13 +35,15 @@ class Consumer(EnhancedEventEmitter):
 
         # Closed flag.
         self._closed: bool = False
-        # Observer instance.
-        self._observer: AsyncIOEventEmitter = AsyncIOEventEmitter()
+        # Observer instance, created on first access.
+        self._observer: Optional[AsyncIOEventEmitter] = None
 
         self._id = id
         self._localId = localId
         self._producerId = producerId
         self._track = track
+        # A Consumer never replaces its track, so its kind is fixed.
+        self._kind = track.kind
         # NOTE: 'AudioStreamTrack' object has no attribute 'enabled'
         self._paused: bool = False
         self._rtpParameters = rtpParameters
@@ -73,7 +75,7 @@ class Consumer(EnhancedEventEmitter):
     # Media kind.
     @property
     def kind(self) -> MediaStreamTrack.kind:
-        return self._track.kind
+        return self._kind
 
     # Associated RTCRtpReceiver.
     @property
@@ -113,6 +115,8 @@ class Consumer(EnhancedEventEmitter):
     # @emits trackended
     @property
     def observer(self) -> AsyncIOEventEmitter:
+        if self._observer is None:
+            self._observer = AsyncIOEventEmitter()
         return self._observer
 
     async def close(self):
@@ -128,7 +132,7 @@ class Consumer(EnhancedEventEmitter):
         await self.emit_for_results("@close")
 
         # Emit observer event.
-        self._observer.emit("close")
+        self._emitObserver("close")
 
     # Transport was closed.
     def transportClosed(self):
@@ -143,7 +147,7 @@ class Consumer(EnhancedEventEmitter):
 
         self.emit("transportclose")
 
-        self._observer.emit("close")
+        self._emitObserver("close")
 
     # Get associated RTCRtpSender stats.
     async def getStats(self):
@@ -162,12 +166,7 @@ class Consumer(EnhancedEventEmitter):
 
         self._paused = True
 
-        if self._track and self._disableTrackOnPause:
-            # TODO: MediaStreamTrack missing enable property
-            # self._track.enabled = False
-            pass
-
-        self._observer.emit("pause")
+        self._emitObserver("pause")
 
     # Resumes sending media.
     def resume(self):
@@ -179,18 +178,18 @@ class Consumer(EnhancedEventEmitter):
 
         self._paused = False
 
-        if self._track and self._disableTrackOnPause:
-            # TODO: MediaStreamTrack missing enable property
-            # self._track.enabled = True
-            pass
+        self._emitObserver("resume")
 
-        self._observer.emit("resume")
+    # Nobody can listen to an observer that was never accessed.
+    def _emitObserver(self, event: str):
+        if self._observer is not None:
+            self._observer.emit(event)
 
     def _onTrackEnded(self):
         logger.debug('track "ended" event')
         self.emit("trackended")
         # Emit observer event.
-        self._observer.emit("trackended")
+        self._emitObserver("trackended")
 
     def _handleTrack(self):
         if not self._track:
@@ -202,6 +201,9 @@ class Consumer(EnhancedEventEmitter):
         if not self._track:
             return
 
+        if self._track.readyState == "ended":
+            return
+
         self._track.remove_listener("ended", self._onTrackEnded)
 
         self._track.stop()
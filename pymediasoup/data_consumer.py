@@ -1,9 +1,13 @@
+from __future__ import annotations
+
 from typing import Optional, Any, Literal
 
+import asyncio
 import logging
-from pydantic import BaseModel
+from dataclasses import dataclass, field
 from pyee import AsyncIOEventEmitter
 from aiortc import RTCDataChannel
+from .errors import InvalidStateError
 from .emitter import EnhancedEventEmitter
 from .sctp_parameters import SctpStreamParameters
 
@@ -11,13 +15,14 @@ from .sctp_parameters import SctpStreamParameters
 logger = logging.getLogger(__name__)
 
 
-class DataConsumerOptions(BaseModel):
+@dataclass
+class DataConsumerOptions:
     id: str
     dataProducerId: str
     sctpStreamParameters: SctpStreamParameters
-    label: Optional[str]
-    protocol: Optional[str]
-    appData: Optional[dict] = {}
+    label: Optional[str] = None
+    protocol: Optional[str] = None
+    appData: Optional[dict] = field(default_factory=dict)
 
 
 class DataConsumer(EnhancedEventEmitter):
@@ -28,18 +33,24 @@ class DataConsumer(EnhancedEventEmitter):
         dataChannel: RTCDataChannel,
         sctpStreamParameters: SctpStreamParameters,
         appData: Optional[dict] = {},
-        loop=None,
     ):
-        super(DataConsumer, self).__init__(loop=loop)
+        super(DataConsumer, self).__init__()
 
         # Closed flag.
         self._closed: bool = False
-        # Observer instance.
-        self._observer: AsyncIOEventEmitter = AsyncIOEventEmitter()
+        # Observer instance, created on first access.
+        self._observer: Optional[AsyncIOEventEmitter] = None
+        # Set once the DataChannel opens or the DataConsumer closes.
+        self._openEvent: asyncio.Event = asyncio.Event()
+        if dataChannel.readyState == "open":
+            self._openEvent.set()
 
         self._id = id
         self._dataProducerId = dataProducerId
         self._dataChannel = dataChannel
+        # label and protocol never change once the DataChannel exists.
+        self._label: str = dataChannel.label
+        self._protocol: str = dataChannel.protocol
         self._sctpStreamParameters = sctpStreamParameters
         self._appData = appData
 
@@ -73,12 +84,12 @@ class DataConsumer(EnhancedEventEmitter):
     # DataChannel label.
     @property
     def label(self) -> str:
-        return self._dataChannel.label
+        return self._label
 
     # DataChannel protocol.
     @property
     def protocol(self) -> str:
-        return self._dataChannel.protocol
+        return self._protocol
 
     # DataChannel binaryType.
     @property
@@ -102,8 +113,17 @@ class DataConsumer(EnhancedEventEmitter):
     # Observer.
     @property
     def observer(self) -> AsyncIOEventEmitter:
+        if self._observer is None:
+            self._observer = AsyncIOEventEmitter()
         return self._observer
 
+    # Wait until the DataChannel is open.
+    async def waitOpen(self):
+        await self._openEvent.wait()
+
+        if self._closed:
+            raise InvalidStateError("closed")
+
     # Closes the DataConsumer.
     async def close(self):
         if self._closed:
@@ -112,13 +132,14 @@ class DataConsumer(EnhancedEventEmitter):
         logger.debug("DataConsumer close()")
 
         self._closed = True
+        self._openEvent.set()
 
         self._dataChannel.close()
 
         await self.emit_for_results("@close")
 
         # Emit observer event.
-        self._observer.emit("close")
+        self._emitObserver("close")
 
     # Transport was closed.
     def transportClosed(self):
@@ -127,43 +148,56 @@ class DataConsumer(EnhancedEventEmitter):
 
         logger.debug("DataConsumer transportClosed()")
 
+        self._doClose("transportclose")
+
+    # Shared tail of transportClosed() and the DataChannel "close" handler.
+    def _doClose(self, event: str, closeDataChannel: bool = True):
         self._closed = True
+        self._openEvent.set()
 
-        self._dataChannel.close()
+        if closeDataChannel:
+            self._dataChannel.close()
 
-        self.emit("transportclose")
+        self.emit(event)
 
-        self._observer.emit("close")
+        self._emitObserver("close")
 
-    def _handleDataChannel(self):
-        @self._dataChannel.on("open")
-        def on_open():
-            if self._closed:
-                return
-            logger.debug('DataConsumer DataChannel "open" event')
-            self.emit("open")
+    # Nobody can listen to an observer that was never accessed.
+    def _emitObserver(self, event: str):
+        if self._observer is not None:
+            self._observer.emit(event)
 
+    def _handleDataChannel(self):
+        self._dataChannel.on("open", self._onDataChannelOpen)
         # NOTE: aiortc.RTCDataChannel won't emit error event, here use pyee error event
-        @self._dataChannel.on("error")
-        def on_error(message):
-            if self._closed:
-                return
-
-            logger.error(f'DataConsumer DataChannel "error" event: {message}')
-
-            self.emit("error", message)
-
-        @self._dataChannel.on("close")
-        def on_close():
-            if self._closed:
-                return
-            logger.warning('DataConsumer DataChannel "close" event')
-            self._closed = True
-            self.emit("@close")
-            self._observer.emit("close")
-
-        @self._dataChannel.on("message")
-        def on_message(message):
-            if self._closed:
-                return
-            self.emit("message", message)
+        self._dataChannel.on("error", self._onDataChannelError)
+        self._dataChannel.on("close", self._onDataChannelClose)
+        self._dataChannel.on("message", self._onDataChannelMessage)
+
+    def _onDataChannelOpen(self):
+        if self._closed:
+            return
+        logger.debug('DataConsumer DataChannel "open" event')
+
+        self._openEvent.set()
+        self.emit("open")
+
+    def _onDataChannelError(self, message):
+        if self._closed:
+            return
+
+        logger.error('DataConsumer DataChannel "error" event: %s', message)
+
+        self.emit("error", message)
+
+    def _onDataChannelClose(self):
+        if self._closed:
+            return
+        logger.warning('DataConsumer DataChannel "close" event')
+        self._doClose("@close", closeDataChannel=False)
+
+    def _onDataChannelMessage(self, message):
+        # Skip the dispatch when the application does not listen for messages.
+        if self._closed or not self._cachedListeners("message"):
+            return
+        self.emit("message", message)
@@ -1,9 +1,12 @@
-from typing import Optional, Any, Union, Literal
+from __future__ import annotations
 
+from typing import Optional, Any, Union, Literal, Iterable
+
+import asyncio
 import logging
+from dataclasses import dataclass, field
 from pyee import AsyncIOEventEmitter
 from aiortc import RTCDataChannel
-from pydantic import BaseModel
 from .errors import InvalidStateError
 from .emitter import EnhancedEventEmitter
 from .sctp_parameters import SctpStreamParameters
@@ -12,13 +15,14 @@ from .sctp_parameters import SctpStreamParameters
 logger = logging.getLogger(__name__)
 
 
-class DataProducerOptions(BaseModel):
-    ordered: Optional[bool]
-    maxPacketLifeTime: Optional[int]
-    maxRetransmits: Optional[int]
-    label: Optional[str]
-    protocol: Optional[str]
-    appData: Optional[dict] = {}
+@dataclass
+class DataProducerOptions:
+    ordered: Optional[bool] = None
+    maxPacketLifeTime: Optional[int] = None
+    maxRetransmits: Optional[int] = None
+    label: Optional[str] = None
+    protocol: Optional[str] = None
+    appData: Optional[dict] = field(default_factory=dict)
 
 
 class DataProducer(EnhancedEventEmitter):
@@ -28,17 +32,23 @@ class DataProducer(EnhancedEventEmitter):
         dataChannel: RTCDataChannel,
         sctpStreamParameters: SctpStreamParameters,
         appData: Optional[dict] = None,
-        loop=None,
     ):
-        super(DataProducer, self).__init__(loop=loop)
+        super(DataProducer, self).__init__()
 
         # Closed flag.
         self._closed: bool = False
-        # Observer instance.
-        self._observer: AsyncIOEventEmitter = AsyncIOEventEmitter()
+        # Observer instance, created on first access.
+        self._observer: Optional[AsyncIOEventEmitter] = None
+        # Set once the DataChannel opens or the DataProducer closes.
+        self._openEvent: asyncio.Event = asyncio.Event()
+        if dataChannel.readyState == "open":
+            self._openEvent.set()
 
         self._id = id
         self._dataChannel = dataChannel
+        # label and protocol never change once the DataChannel exists.
+        self._label: str = dataChannel.label
+        self._protocol: str = dataChannel.protocol
         self._sctpStreamParameters = sctpStreamParameters
         self._appData = appData
 
@@ -67,12 +77,12 @@ class DataProducer(EnhancedEventEmitter):
     # DataChannel label.
     @property
     def label(self) -> str:
-        return self._dataChannel.label
+        return self._label
 
     # DataChannel protocol.
     @property
     def protocol(self) -> str:
-        return self._dataChannel.protocol
+        return self._protocol
 
     # DataChannel bufferedAmount.
     @property
@@ -102,8 +112,17 @@ class DataProducer(EnhancedEventEmitter):
     # Observer.
     @property
     def observer(self) -> AsyncIOEventEmitter:
+        if self._observer is None:
+            self._observer = AsyncIOEventEmitter()
         return self._observer
 
+    # Wait until the DataChannel is open.
+    async def waitOpen(self):
+        await self._openEvent.wait()
+
+        if self._closed:
+            raise InvalidStateError("closed")
+
     # Closes the DataProducer.
     async def close(self):
         if self._closed:
@@ -112,13 +131,14 @@ class DataProducer(EnhancedEventEmitter):
         logger.debug("DataProducer close()")
 
         self._closed = True
+        self._openEvent.set()
 
         self._dataChannel.close()
 
         await self.emit_for_results("@close")
 
         # Emit observer event.
-        self._observer.emit("close")
+        self._emitObserver("close")
 
     # Transport was closed.
     def transportClosed(self):
@@ -127,62 +147,92 @@ class DataProducer(EnhancedEventEmitter):
 
         logger.debug("DataProducer transportClosed()")
 
+        self._doClose("transportclose")
+
+    # Send a message. bytearray and memoryview payloads are copied into bytes,
+    # which is the only binary type aiortc accepts.
+    def send(self, data: Union[bytes, bytearray, memoryview, str]):
+        if self._closed or self._dataChannel.readyState != "open":
+            raise InvalidStateError("closed" if self._closed else "not open")
+
+        logger.debug("DataProducer send()")
+
+        if isinstance(data, (bytearray, memoryview)):
+            data = bytes(data)
+
+        self._dataChannel.send(data)
+
+    # Send several messages in a row.
+    def sendBatch(self, messages: Iterable[Union[bytes, bytearray, memoryview, str]]):
+        if self._closed or self._dataChannel.readyState != "open":
+            raise InvalidStateError("closed" if self._closed else "not open")
+
+        logger.debug("DataProducer sendBatch()")
+
+        send = self._dataChannel.send
+        for data in messages:
+            if isinstance(data, (bytearray, memoryview)):
+                data = bytes(data)
+            send(data)
+
+    # Shared tail of transportClosed() and the DataChannel "close" handler.
+    def _doClose(self, event: str, closeDataChannel: bool = True):
         self._closed = True
+        self._openEvent.set()
 
-        self._dataChannel.close()
+        if closeDataChannel:
+            self._dataChannel.close()
 
-        self.emit("transportclose")
+        self.emit(event)
 
-        self._observer.emit("close")
+        self._emitObserver("close")
 
-    # Send a message.
-    def send(self, data: Union[bytes, str]):
-        logger.debug("DataProducer send()")
+    # Nobody can listen to an observer that was never accessed.
+    def _emitObserver(self, event: str):
+        if self._observer is not None:
+            self._observer.emit(event)
 
+    def _handleDataChannel(self):
+        self._dataChannel.on("open", self._onDataChannelOpen)
+        # NOTE: aiortc.RTCDataChannel won't emit error event, here use pyee error event
+        self._dataChannel.on("error", self._onDataChannelError)
+        self._dataChannel.on("close", self._onDataChannelClose)
+        self._dataChannel.on("message", self._onDataChannelMessage)
+        self._dataChannel.on("bufferedamountlow", self._onDataChannelBufferedAmountLow)
+
+    def _onDataChannelOpen(self):
         if self._closed:
-            raise InvalidStateError("closed")
+            return
 
-        self._dataChannel.send(data)
+        logger.debug('DataProducer DataChannel "open" event')
 
-    def _handleDataChannel(self):
-        @self._dataChannel.on("open")
-        def on_open():
-            if self._closed:
-                return
+        self._openEvent.set()
 
-            logger.debug('DataProducer DataChannel "open" event')
+        self.emit("open")
 
-            self.emit("open")
+    def _onDataChannelError(self, message):
+        if self._closed:
+            return
 
-        # NOTE: aiortc.RTCDataChannel won't emit error event, here use pyee error event
-        @self._dataChannel.on("error")
-        def on_error(message):
-            if self._closed:
-                return
-
-            logger.error(f'DataProducer DataChannel "error" event: {message}')
-
-            self.emit("error", message)
-
-        @self._dataChannel.on("close")
-        def on_close():
-            if self._closed:
-                return
-            logger.warning('DataProducer DataChannel "close" event')
-            self._closed = True
-            self.emit("@close")
-            self._observer.emit("close")
-
-        @self._dataChannel.on("message")
-        def on_message(message):
-            if self._closed:
-                return
-            logger.warning(
-                f'DataProducer DataChannel "message" event in a DataProducer, message discarded: {message}'
-            )
-
-        @self._dataChannel.on("bufferedamountlow")
-        def on_bufferedamountlow():
-            if self._closed:
-                return
-            self.emit("bufferedamountlow")
+        logger.error('DataProducer DataChannel "error" event: %s', message)
+
+        self.emit("error", message)
+
+    def _onDataChannelClose(self):
+        if self._closed:
+            return
+        logger.warning('DataProducer DataChannel "close" event')
+        self._doClose("@close", closeDataChannel=False)
+
+    def _onDataChannelMessage(self, message):
+        if self._closed:
+            return
+        logger.warning(
+            'DataProducer DataChannel "message" event in a DataProducer, message discarded: %s',
+            message,
+        )
+
+    def _onDataChannelBufferedAmountLow(self):
+        if self._closed:
+            return
+        self.emit("bufferedamountlow")
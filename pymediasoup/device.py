@@ -74,14 +74,12 @@ class Device:
     # Initialize the Device.
     async def load(self, routerRtpCapabilities: Union[RtpCapabilities, dict]):
         logger.debug(f"Device load() [routerRtpCapabilities:{routerRtpCapabilities}]")
+        # getExtendedRtpCapabilities() only reads the router capabilities, so a
+        # given RtpCapabilities is used as is.
         if isinstance(routerRtpCapabilities, dict):
             routerRtpCapabilities: RtpCapabilities = RtpCapabilities(
                 **routerRtpCapabilities
             )
-        else:
-            routerRtpCapabilities: RtpCapabilities = routerRtpCapabilities.copy(
-                deep=True
-            )
         # Temporal handler to get its capabilities.
         if self._loaded:
             logger.warning("already loaded")
@@ -128,9 +126,10 @@ class Device:
     def canProduce(self, kind: Literal["video", "audio"]):
         if not self._loaded:
             raise InvalidStateError("not loaded")
-        elif kind not in ["video", "audio"]:
+        canProduce = self._canProduceByKind.get(kind)
+        if canProduce is None:
             raise TypeError(f"invalid kind {kind}")
-        return self._canProduceByKind[kind]
+        return canProduce
 
     # Creates a Transport for sending media.
     # @raise {InvalidStateError} if not loaded.
@@ -180,19 +179,8 @@ class Device:
         appData: Optional[dict] = {},
     ) -> Transport:
         logger.debug("createRecvTransport()")
-        if isinstance(iceParameters, dict):
-            iceParameters: IceParameters = IceParameters(**iceParameters)
-
-        iceCandidates = [
-            IceCandidate(**c) if isinstance(c, dict) else c for c in iceCandidates
-        ]
-
-        if isinstance(dtlsParameters, dict):
-            dtlsParameters: DtlsParameters = DtlsParameters(**dtlsParameters)
-
-        if isinstance(sctpParameters, dict):
-            sctpParameters: SctpParameters = SctpParameters(**sctpParameters)
-
+        # Dicts are validated into models by InternalTransportOptions, like in
+        # createSendTransport().
         return self._createTransport(
             direction="recv",
             id=id,
@@ -1,3 +1,5 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+
 from pyee import AsyncIOEventEmitter
 
 
@@ -5,9 +7,12 @@ class EnhancedEventEmitter(AsyncIOEventEmitter):
     def __init__(self, loop=None):
         super(EnhancedEventEmitter, self).__init__(loop=loop)
 
+        # Listeners per event, rebuilt after the event's listeners change.
+        self._listenerCache: Dict[str, Tuple[Callable, ...]] = {}
+
     async def emit_for_results(self, event, *args, **kwargs):
         results = []
-        for f in list(self._events[event].values()):
+        for f in self._cachedListeners(event):
             try:
                 result = await f(*args, **kwargs)
             except Exception as exc:
@@ -16,3 +21,40 @@ class EnhancedEventEmitter(AsyncIOEventEmitter):
                 if result:
                     results.append(result)
         return results
+
+    def _cachedListeners(self, event: str) -> Tuple[Callable, ...]:
+        funcs = self._listenerCache.get(event)
+        if funcs is None:
+            with self._lock:
+                handlers = self._events.get(event)
+                funcs = tuple(handlers.values()) if handlers else ()
+            self._listenerCache[event] = funcs
+        return funcs
+
+    # Same as pyee's, but iterates the cached tuple instead of copying the
+    # listeners on every emit.
+    def _call_handlers(
+        self,
+        event: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> bool:
+        funcs = self._cachedListeners(event)
+        for f in funcs:
+            self._emit_run(f, args, kwargs)
+        return bool(funcs)
+
+    def _add_event_handler(self, event: str, k: Callable, v: Callable):
+        super(EnhancedEventEmitter, self)._add_event_handler(event, k, v)
+        self._listenerCache.pop(event, None)
+
+    def _remove_listener(self, event: str, f: Callable) -> None:
+        super(EnhancedEventEmitter, self)._remove_listener(event, f)
+        self._listenerCache.pop(event, None)
+
+    def remove_all_listeners(self, event: Optional[str] = None) -> None:
+        super(EnhancedEventEmitter, self).remove_all_listeners(event)
+        if event is not None:
+            self._listenerCache.pop(event, None)
+        else:
+            self._listenerCache.clear()
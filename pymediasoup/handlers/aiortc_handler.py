@@ -1,5 +1,6 @@
 from typing import Dict, Literal, List, Optional, Any
 
+import asyncio
 import logging
 from aiortc import (
     RTCIceServer,
@@ -25,7 +26,11 @@ from ..rtp_parameters import (
     RtcpParameters,
 )
 from ..sctp_parameters import SctpCapabilities, SctpParameters, SctpStreamParameters
-from ..ortc import getSendingRtpParameters, getSendingRemoteRtpParameters, reduceCodecs
+from ..ortc import (
+    getSendingRtpParametersByKind,
+    getSendingRemoteRtpParametersByKind,
+    reduceCodecs,
+)
 from ..scalability_modes import parse as smParse
 from ..models.transport import IceCandidate, IceParameters, DtlsParameters, DtlsRole
 from ..models.handler_interface import (
@@ -43,6 +48,22 @@ from ..producer import ProducerCodecOptions
 
 logger = logging.getLogger(__name__)
 SCTP_NUM_STREAMS = {"OS": 1024, "MIS": 1024}
+# Native RTP capabilities only depend on the installed aiortc, so they are
+# probed once per process.
+_nativeRtpCapabilities: Optional[RtpCapabilities] = None
+# Transport connection state for each ICE connection state.
+ICE_CONNECTION_STATES = {
+    "checking": "connecting",
+    "connected": "connected",
+    "completed": "connected",
+    "failed": "failed",
+    "disconnected": "disconnected",
+    "closed": "closed",
+}
+# Native SCTP capabilities are fixed, so they are validated once.
+NATIVE_SCTP_CAPABILITIES = SctpCapabilities.parse_obj({"numStreams": SCTP_NUM_STREAMS})
+# RIDs assigned to simulcast encodings, in order.
+RIDS = tuple(f"r{idx}" for idx in range(8))
 
 
 class AiortcHandler(HandlerInterface):
@@ -68,12 +89,28 @@ class AiortcHandler(HandlerInterface):
         self._nextSendSctpStreamId = 0
         # Got transport local and remote parameters.
         self._transportReady = False
+        # Last connection state emitted in "@connectionstatechange".
+        self._connectionState: Optional[str] = None
+        # Renegotiation shared by the pending stopReceiving() calls.
+        self._stopReceivingTask: Optional[asyncio.Future] = None
+        # Whether m= sections were closed since the last stopReceiving()
+        # renegotiation took its offer.
+        self._stopReceivingPending = False
+        # Serializes the offer/answer exchanges of a receiving handler. Created
+        # on first use so that it belongs to the running loop.
+        self._recvNegotiationLock: Optional[asyncio.Lock] = None
         self._tracks = tracks
 
     @classmethod
     def createFactory(cls, tracks: List[MediaStreamTrack] = [], loop=None):
         return lambda: cls(tracks, loop)
 
+    # Probe the native RTP capabilities up front so that the first
+    # Device.load() in the process does not pay for it.
+    @classmethod
+    async def warmUp(cls):
+        await cls().getNativeRtpCapabilities()
+
     @property
     def name(self) -> str:
         return "aiortc"
@@ -99,8 +136,16 @@ class AiortcHandler(HandlerInterface):
             await self._pc.close()
 
     async def getNativeRtpCapabilities(self) -> RtpCapabilities:
+        global _nativeRtpCapabilities
+
         logger.debug("getNativeRtpCapabilities()")
 
+        if _nativeRtpCapabilities is None:
+            _nativeRtpCapabilities = await self._probeNativeRtpCapabilities()
+
+        return _nativeRtpCapabilities.copy(deep=True)
+
+    async def _probeNativeRtpCapabilities(self) -> RtpCapabilities:
         pc = RTCPeerConnection()
         for track in self._tracks:
             pc.addTrack(track)
@@ -119,7 +164,7 @@ class AiortcHandler(HandlerInterface):
 
     async def getNativeSctpCapabilities(self) -> SctpCapabilities:
         logger.debug("getNativeSctpCapabilities()")
-        return SctpCapabilities.parse_obj({"numStreams": SCTP_NUM_STREAMS})
+        return NATIVE_SCTP_CAPABILITIES.copy(deep=True)
 
     def run(
         self,
@@ -154,18 +199,15 @@ class AiortcHandler(HandlerInterface):
             dtlsParameters=options.dtlsParameters,
             sctpParameters=options.sctpParameters,
         )
-        self._sendingRtpParametersByKind = {
-            "audio": getSendingRtpParameters("audio", options.extendedRtpCapabilities),
-            "video": getSendingRtpParameters("video", options.extendedRtpCapabilities),
-        }
-        self._sendingRemoteRtpParametersByKind = {
-            "audio": getSendingRemoteRtpParameters(
-                "audio", options.extendedRtpCapabilities
-            ),
-            "video": getSendingRemoteRtpParameters(
-                "video", options.extendedRtpCapabilities
-            ),
-        }
+        # Only sending handlers need the generic sending RTP parameters. They
+        # are computed once per Device and shared by its sending handlers.
+        if options.direction == "send":
+            self._sendingRtpParametersByKind = getSendingRtpParametersByKind(
+                options.extendedRtpCapabilities
+            )
+            self._sendingRemoteRtpParametersByKind = (
+                getSendingRemoteRtpParametersByKind(options.extendedRtpCapabilities)
+            )
 
         configuration = RTCConfiguration(iceServers=iceServers)
 
@@ -173,16 +215,9 @@ class AiortcHandler(HandlerInterface):
 
         @self._pc.on("iceconnectionstatechange")
         def on_iceconnectionstatechange():
-            if self._pc.iceConnectionState == "checking":
-                self.emit("@connectionstatechange", "connecting")
-            elif self._pc.iceConnectionState in ["connected", "completed"]:
-                self.emit("@connectionstatechange", "connected")
-            elif self._pc.iceConnectionState == "failed":
-                self.emit("@connectionstatechange", "failed")
-            elif self._pc.iceConnectionState == "disconnected":
-                self.emit("@connectionstatechange", "disconnected")
-            elif self._pc.iceConnectionState == "closed":
-                self.emit("@connectionstatechange", "closed")
+            connectionState = ICE_CONNECTION_STATES.get(self._pc.iceConnectionState)
+            if connectionState is not None:
+                self._emitConnectionState(connectionState)
 
     async def updateIceServers(self, iceServers):
         logger.warning("updateIceServers() not implemented")
@@ -197,29 +232,31 @@ class AiortcHandler(HandlerInterface):
             # NOTE: aiortc RTCPeerConnection createOffer do not have iceRestart options
             offer = await self._pc.createOffer()
             logger.debug(
-                f"restartIce() | calling pc.setLocalDescription() [offer:{offer}]"
+                "restartIce() | calling pc.setLocalDescription() [offer:%s]", offer
             )
             await self._pc.setLocalDescription(offer)
             answer: RTCSessionDescription = RTCSessionDescription(
                 type="answer", sdp=self._remoteSdp.getSdp()
             )
             logger.debug(
-                f"restartIce() | calling pc.setRemoteDescription() [answer:{answer}]"
+                "restartIce() | calling pc.setRemoteDescription() [answer:%s]", answer
             )
             await self._pc.setRemoteDescription(answer)
         else:
-            offer: RTCSessionDescription = RTCSessionDescription(
-                type="offer", sdp=self._remoteSdp.getSdp()
-            )
-            logger.debug(
-                f"restartIce() | calling pc.setRemoteDescription() [offer:{offer}]"
-            )
-            await self._pc.setRemoteDescription(offer)
-            answer = await self._pc.createAnswer()
-            logger.debug(
-                f"restartIce() | calling pc.setLocalDescription() [answer:{answer}]"
-            )
-            await self._pc.setLocalDescription(answer)
+            async with self._getRecvNegotiationLock():
+                offer: RTCSessionDescription = RTCSessionDescription(
+                    type="offer", sdp=self._remoteSdp.getSdp()
+                )
+                logger.debug(
+                    "restartIce() | calling pc.setRemoteDescription() [offer:%s]", offer
+                )
+                await self._pc.setRemoteDescription(offer)
+                answer = await self._pc.createAnswer()
+                logger.debug(
+                    "restartIce() | calling pc.setLocalDescription() [answer:%s]",
+                    answer,
+                )
+                await self._pc.setLocalDescription(answer)
 
     async def getTransportStats(self):
         return self._pc.getStats()
@@ -231,78 +268,91 @@ class AiortcHandler(HandlerInterface):
         codecOptions: Optional[ProducerCodecOptions] = None,
         codec: Optional[RtpCodecCapability] = None,
     ) -> HandlerSendResult:
+        self._assertSendDirection()
         options = HandlerSendOptions(
             track=track, encodings=encodings, codecOptions=codecOptions, codec=codec
         )
-        self._assertSendDirection()
-        logger.debug(f"send() [kind:{options.track.kind}, track.id:{options.track.id}]")
-        if options.encodings:
-            for idx in range(len(options.encodings)):
-                options.encodings[idx].rid = f"r{idx}"
+        logger.debug(
+            "send() [kind:%s, track.id:%s]", options.track.kind, options.track.id
+        )
+        for idx, encoding in enumerate(options.encodings):
+            encoding.rid = RIDS[idx] if idx < len(RIDS) else f"r{idx}"
 
+        # Reduce the codecs before copying so that only the kept ones are
+        # deep-copied.
         sendingRtpParameters: RtpParameters = self._sendingRtpParametersByKind[
             options.track.kind
-        ].copy(deep=True)
-        sendingRtpParameters.codecs = reduceCodecs(
-            sendingRtpParameters.codecs, options.codec
+        ]
+        sendingRtpParameters = sendingRtpParameters.copy(
+            update={"codecs": reduceCodecs(sendingRtpParameters.codecs, options.codec)},
+            deep=True,
         )
 
         sendingRemoteRtpParameters: RtpParameters = (
-            self._sendingRemoteRtpParametersByKind[options.track.kind].copy(deep=True)
+            self._sendingRemoteRtpParametersByKind[options.track.kind]
         )
-        sendingRemoteRtpParameters.codecs = reduceCodecs(
-            sendingRemoteRtpParameters.codecs, options.codec
+        sendingRemoteRtpParameters = sendingRemoteRtpParameters.copy(
+            update={
+                "codecs": reduceCodecs(sendingRemoteRtpParameters.codecs, options.codec)
+            },
+            deep=True,
         )
 
         mediaSectionIdx = self.remoteSdp.getNextMediaSectionIdx()
         transceiver = self.pc.addTransceiver(options.track, direction="sendonly")
 
+        mimeType = sendingRtpParameters.codecs[0].mimeType.lower()
+
+        # Special case for VP9 with SVC. The scalability mode is only parsed
+        # when it can matter.
+        hackVp9Svc = False
+        if len(options.encodings) == 1 and mimeType == "video/vp9":
+            layers = smParse(options.encodings[0].scalabilityMode or "")
+            if layers.spatialLayers > 1:
+                logger.debug("send() | enabling legacy simulcast for VP9 SVC")
+                hackVp9Svc = True
+
         offer: RTCSessionDescription = await self.pc.createOffer()
         offerMediaDict: dict
-        localSdpDict = sdp_transform.parse(offer.sdp)
-        if not self._transportReady:
-            await self._setupTransport(
-                localDtlsRole="server", localSdpDict=localSdpDict
-            )
-        # Special case for VP9 with SVC.
-        hackVp9Svc = False
-        if options.encodings:
-            layers = smParse(
-                options.encodings[0].scalabilityMode
-                if options.encodings[0].scalabilityMode
-                else ""
-            )
-        else:
-            layers = smParse("")
-        if (
-            len(options.encodings) == 1
-            and layers.spatialLayers > 1
-            and sendingRtpParameters.codecs[0].mimeType.lower() == "video/vp9"
-        ):
-            logger.debug("send() | enabling legacy simulcast for VP9 SVC")
-            hackVp9Svc = True
-            localSdpDict = sdp_transform.parse
-            offerMediaDict = localSdpDict["media"][mediaSectionIdx.idx]
-            addLegacySimulcast(
-                offerMediaDict=offerMediaDict, numStreams=layers.spatialLayers
-            )
-            offer = RTCSessionDescription(
-                type="offer", sdp=sdp_transform.write(localSdpDict)
-            )
+        # The offer is only parsed when it is needed before
+        # setLocalDescription(), and then just once.
+        localSdpDict: Optional[dict] = None
+        if not self._transportReady or hackVp9Svc:
+            offerSdpDict: dict = sdp_transform.parse(offer.sdp)
+            localSdpDict = offerSdpDict
+            if not self._transportReady:
+                await self._setupTransport(
+                    localDtlsRole="server", localSdpDict=offerSdpDict
+                )
+            if hackVp9Svc:
+                offerMediaDict = offerSdpDict["media"][mediaSectionIdx.idx]
+                addLegacySimulcast(
+                    offerMediaDict=offerMediaDict, numStreams=layers.spatialLayers
+                )
+                offer = RTCSessionDescription(
+                    type="offer", sdp=sdp_transform.write(offerSdpDict)
+                )
 
-        logger.debug(f"send() | calling pc.setLocalDescription() [offer:{offer}]")
+        logger.debug("send() | calling pc.setLocalDescription() [offer:%s]", offer)
 
         await self.pc.setLocalDescription(offer)
         # We can now get the transceiver.mid.
         localId = transceiver.mid
         # Set MID.
         sendingRtpParameters.mid = localId
-        localSdpDict = sdp_transform.parse(self.pc.localDescription.sdp)
+        # aiortc assigns the MIDs and SSRCs in createOffer(), so an offer
+        # that was already parsed above is reused instead of parsing the
+        # local description again.
+        if localSdpDict is None:
+            localSdpDict = sdp_transform.parse(self.pc.localDescription.sdp)
 
         offerMediaDict = localSdpDict["media"][mediaSectionIdx.idx]
 
         logger.debug(
-            f"send() | get offerMediaDict {offerMediaDict} \n from localSdpDict {localSdpDict['media']} index {mediaSectionIdx.idx}"  # noqa
+            "send() | get offerMediaDict %s \n from localSdpDict %s index %s",
+            offerMediaDict,
+            localSdpDict["media"],
+            mediaSectionIdx.idx,
         )
         # Set RTCP CNAME.
         if sendingRtpParameters.rtcp is None:
@@ -316,10 +366,11 @@ class AiortcHandler(HandlerInterface):
         elif len(options.encodings) == 1:
             newEncodings = getRtpEncodings(offerMediaDict)
             if newEncodings and options.encodings[0]:
-                firstEncodingDict: dict = newEncodings[0].dict()
-                optionsEncodingDict: dict = options.encodings[0].dict()
-                firstEncodingDict.update(optionsEncodingDict)
-                newEncodings[0] = RtpEncodingParameters(**firstEncodingDict)
+                # Only the fields given by the application override the ones
+                # parsed from the SDP (e.g. the ssrc).
+                newEncodings[0] = newEncodings[0].copy(
+                    update=options.encodings[0].dict(exclude_unset=True)
+                )
                 if hackVp9Svc:
                     newEncodings = [newEncodings[0]]
             sendingRtpParameters.encodings = newEncodings
@@ -328,9 +379,9 @@ class AiortcHandler(HandlerInterface):
             sendingRtpParameters.encodings = options.encodings
         # If VP8 or H264 and there is effective simulcast, add scalabilityMode to
         # each encoding.
-        if len(sendingRtpParameters.encodings) > 1 and (
-            sendingRtpParameters.codecs[0].mimeType.lower() == "video/vp8"
-            or sendingRtpParameters.codecs[0].mimeType.lower() == "video/h264"
+        if len(sendingRtpParameters.encodings) > 1 and mimeType in (
+            "video/vp8",
+            "video/h264",
         ):
             for encoding in sendingRtpParameters.encodings:
                 encoding.scalabilityMode = "S1T3"
@@ -345,7 +396,7 @@ class AiortcHandler(HandlerInterface):
         answer: RTCSessionDescription = RTCSessionDescription(
             type="answer", sdp=self.remoteSdp.getSdp()
         )
-        logger.debug(f"send() | calling pc.setRemoteDescription() [answer:{answer}]")
+        logger.debug("send() | calling pc.setRemoteDescription() [answer:%s]", answer)
         await self.pc.setRemoteDescription(answer)
         # Store in the map.
         self._mapMidTransceiver[localId] = transceiver
@@ -380,9 +431,9 @@ class AiortcHandler(HandlerInterface):
     async def replaceTrack(self, localId, track=None):
         self._assertSendDirection()
         if track:
-            logger.debug(f"replaceTrack() [localId:{localId}, track.id:{track.id}]")
+            logger.debug("replaceTrack() [localId:%s, track.id:%s]", localId, track.id)
         else:
-            logger.debug(f"replaceTrack() [localId:{localId}, no track]")
+            logger.debug("replaceTrack() [localId:%s, no track]", localId)
         transceiver = self._mapMidTransceiver.get(localId)
         if not transceiver:
             raise Exception("associated RTCRtpTransceiver not found")
@@ -419,6 +470,7 @@ class AiortcHandler(HandlerInterface):
         label: Optional[str] = None,
         protocol: Optional[str] = None,
     ) -> HandlerSendDataChannelResult:
+        self._assertSendDirection()
         if streamId is None:
             streamId = self._nextSendSctpStreamId
         options = SctpStreamParameters(
@@ -429,7 +481,6 @@ class AiortcHandler(HandlerInterface):
             label=label,
             protocol=protocol,
         )
-        self._assertSendDirection()
         logger.debug("sendDataChannel()")
         dataChannel = self.pc.createDataChannel(
             label=options.label,
@@ -448,12 +499,16 @@ class AiortcHandler(HandlerInterface):
         if not self._hasDataChannelMediaSection:
             offer: RTCSessionDescription = await self.pc.createOffer()
             localSdpDict = sdp_transform.parse(offer.sdp)
-            offerMediaDicts = [
-                m for m in localSdpDict.get("media") if m.get("type") == "application"
-            ]
-            if not offerMediaDicts:
+            offerMediaDict = next(
+                (
+                    m
+                    for m in localSdpDict.get("media")
+                    if m.get("type") == "application"
+                ),
+                None,
+            )
+            if offerMediaDict is None:
                 raise Exception("No datachannel")
-            offerMediaDict = offerMediaDicts[0]
 
             if not self._transportReady:
                 await self._setupTransport(
@@ -461,7 +516,7 @@ class AiortcHandler(HandlerInterface):
                 )
 
             logger.debug(
-                f"sendDataChannel() | calling pc.setLocalDescription() [offer:{offer}]"
+                "sendDataChannel() | calling pc.setLocalDescription() [offer:%s]", offer
             )
             await self.pc.setLocalDescription(offer)
             self.remoteSdp.sendSctpAssociation(offerMediaDict=offerMediaDict)
@@ -470,7 +525,8 @@ class AiortcHandler(HandlerInterface):
             )
 
             logger.debug(
-                f"sendDataChannel() | calling pc.setRemoteDescription() [answer:{answer}]"
+                "sendDataChannel() | calling pc.setRemoteDescription() [answer:%s]",
+                answer,
             )
             await self.pc.setRemoteDescription(answer)
             self._hasDataChannelMediaSection = True
@@ -482,81 +538,137 @@ class AiortcHandler(HandlerInterface):
     async def receive(
         self, trackId: str, kind: MediaKind, rtpParameters: RtpParameters
     ) -> HandlerReceiveResult:
+        self._assertRecvDirection()
         options = HandlerReceiveOptions(
             trackId=trackId, kind=kind, rtpParameters=rtpParameters
         )
-        self._assertRecvDirection()
-        logger.debug(f"receive() [trackId:{options.trackId}, kind:{options.kind}]")
-        localId = (
-            options.rtpParameters.mid
-            if options.rtpParameters.mid is not None
-            else str(len(self._mapMidTransceiver))
-        )
-        self.remoteSdp.receive(
-            mid=localId,
-            kind=options.kind,
-            offerRtpParameters=options.rtpParameters,
-            streamId=options.rtpParameters.rtcp.cname,
-            trackId=options.trackId,
-        )
-        offer: RTCSessionDescription = RTCSessionDescription(
-            type="offer", sdp=self.remoteSdp.getSdp()
-        )
-        logger.debug(f"receive() | calling pc.setRemoteDescription() [offer:{offer}]")
-        await self.pc.setRemoteDescription(offer)
-        answer: RTCSessionDescription = await self.pc.createAnswer()
-        localSdpDict = sdp_transform.parse(answer.sdp)
-        answerMediaDict = [
-            m for m in localSdpDict.get("media") if str(m.get("mid")) == localId
-        ][0]
-        # May need to modify codec parameters in the answer based on codec
-        # parameters in the offer.
-        applyCodecParameters(
-            offerRtpParameters=options.rtpParameters, answerMediaDict=answerMediaDict
-        )
-        answer = RTCSessionDescription(
-            type="answer", sdp=sdp_transform.write(localSdpDict)
-        )
-        if not self._transportReady:
-            await self._setupTransport(
-                localDtlsRole="client", localSdpDict=localSdpDict
+        logger.debug("receive() [trackId:%s, kind:%s]", options.trackId, options.kind)
+        async with self._getRecvNegotiationLock():
+            localId = (
+                options.rtpParameters.mid
+                if options.rtpParameters.mid is not None
+                else str(len(self._mapMidTransceiver))
+            )
+            self.remoteSdp.receive(
+                mid=localId,
+                kind=options.kind,
+                offerRtpParameters=options.rtpParameters,
+                streamId=options.rtpParameters.rtcp.cname,
+                trackId=options.trackId,
+            )
+            offer: RTCSessionDescription = RTCSessionDescription(
+                type="offer", sdp=self.remoteSdp.getSdp()
+            )
+            logger.debug(
+                "receive() | calling pc.setRemoteDescription() [offer:%s]", offer
+            )
+            await self.pc.setRemoteDescription(offer)
+            answer: RTCSessionDescription = await self.pc.createAnswer()
+            # applyCodecParameters() only rewrites Opus codecs, so other answers
+            # are used as is once the transport is set up.
+            hasOpus = any(
+                codec.mimeType.lower() == "audio/opus"
+                for codec in options.rtpParameters.codecs
+            )
+            if hasOpus or not self._transportReady:
+                localSdpDict = sdp_transform.parse(answer.sdp)
+                if hasOpus:
+                    # The new m= section is usually the last one, so search
+                    # backwards and stop at the first match.
+                    answerMediaDict = next(
+                        (
+                            m
+                            for m in reversed(localSdpDict.get("media"))
+                            if str(m.get("mid")) == localId
+                        ),
+                        None,
+                    )
+                    if answerMediaDict is None:
+                        raise Exception("answer media section not found")
+                    # May need to modify codec parameters in the answer based on
+                    # codec parameters in the offer.
+                    applyCodecParameters(
+                        offerRtpParameters=options.rtpParameters,
+                        answerMediaDict=answerMediaDict,
+                    )
+                    answer = RTCSessionDescription(
+                        type="answer", sdp=sdp_transform.write(localSdpDict)
+                    )
+                if not self._transportReady:
+                    await self._setupTransport(
+                        localDtlsRole="client", localSdpDict=localSdpDict
+                    )
+            logger.debug(
+                "receive() | calling pc.setLocalDescription() [answer:%s]", answer
+            )
+            await self.pc.setLocalDescription(answer)
+            # aiortc appends the transceiver created by setRemoteDescription(), so
+            # search from the end.
+            transceiver = next(
+                (t for t in reversed(self.pc.getTransceivers()) if t.mid == localId),
+                None,
+            )
+            if transceiver is None:
+                raise Exception("new RTCRtpTransceiver not found")
+            # Store in the map.
+            self._mapMidTransceiver[localId] = transceiver
+
+            return HandlerReceiveResult(
+                localId=localId,
+                track=transceiver.receiver.track,
+                rtpReceiver=transceiver.receiver,
             )
-        logger.debug(f"receive() | calling pc.setLocalDescription() [answer:{answer}]")
-        await self.pc.setLocalDescription(answer)
-        transceivers = [t for t in self.pc.getTransceivers() if t.mid == localId]
-        if not transceivers:
-            raise Exception("new RTCRtpTransceiver not found")
-        # Store in the map.
-        transceiver = transceivers[0]
-        self._mapMidTransceiver[localId] = transceiver
-
-        return HandlerReceiveResult(
-            localId=localId,
-            track=transceiver.receiver.track,
-            rtpReceiver=transceiver.receiver,
-        )
 
     async def stopReceiving(self, localId: str):
         self._assertRecvDirection()
-        logger.debug(f"stopReceiving() [localId:{localId}]")
+        logger.debug("stopReceiving() [localId:%s]", localId)
         transceiver = self._mapMidTransceiver.get(localId)
         if not transceiver:
             raise Exception("associated RTCRtpTransceiver not found")
         self.remoteSdp.closeMediaSection(transceiver.mid)
-        offer: RTCSessionDescription = RTCSessionDescription(
-            type="offer", sdp=self.remoteSdp.getSdp()
-        )
-        logger.debug(
-            f"stopReceiving() | calling pc.setRemoteDescription() [offer:{offer}]"
-        )
-        await self.pc.setRemoteDescription(offer)
-        answer = await self.pc.createAnswer()
-        logger.debug(
-            f"stopReceiving() | calling pc.setLocalDescription() [answer:{answer}]"
-        )
-        await self.pc.setLocalDescription(answer)
+        # Consumers closed together share a single renegotiation.
+        self._stopReceivingPending = True
+        if self._stopReceivingTask is None:
+            self._stopReceivingTask = asyncio.ensure_future(
+                self._renegotiateStopReceiving()
+            )
+            self._stopReceivingTask.add_done_callback(self._onStopReceivingDone)
+        # Shielded so that a cancelled caller does not cancel it for the others.
+        await asyncio.shield(self._stopReceivingTask)
         self._mapMidTransceiver.pop(localId, None)
 
+    async def _renegotiateStopReceiving(self):
+        try:
+            # Sections closed while an offer/answer exchange runs need another
+            # round.
+            while self._stopReceivingPending:
+                # Let the other stopReceiving() calls of this loop turn close
+                # their m= sections first.
+                await asyncio.sleep(0)
+                async with self._getRecvNegotiationLock():
+                    self._stopReceivingPending = False
+                    offer: RTCSessionDescription = RTCSessionDescription(
+                        type="offer", sdp=self.remoteSdp.getSdp()
+                    )
+                    logger.debug(
+                        "stopReceiving() | calling pc.setRemoteDescription() [offer:%s]",
+                        offer,
+                    )
+                    await self.pc.setRemoteDescription(offer)
+                    answer = await self.pc.createAnswer()
+                    logger.debug(
+                        "stopReceiving() | calling pc.setLocalDescription() [answer:%s]",
+                        answer,
+                    )
+                    await self.pc.setLocalDescription(answer)
+        finally:
+            self._stopReceivingTask = None
+
+    def _onStopReceivingDone(self, task: asyncio.Future):
+        # Retrieve the error even when every caller was cancelled.
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("stopReceiving() | renegotiation failed: %s", task.exception())
+
     async def getReceiverStats(self, localId: str):
         self._assertRecvDirection()
         transceiver = self._mapMidTransceiver.get(localId)
@@ -570,11 +682,13 @@ class AiortcHandler(HandlerInterface):
         label: Optional[str] = None,
         protocol: Optional[str] = None,
     ) -> HandlerReceiveDataChannelResult:
+        self._assertRecvDirection()
         options = HandlerReceiveDataChannelOptions(
             sctpStreamParameters=sctpStreamParameters, label=label, protocol=protocol
         )
-        self._assertRecvDirection()
-        logger.debug(f"[receiveDataChannel() [options:{options.sctpStreamParameters}]]")
+        logger.debug(
+            "[receiveDataChannel() [options:%s]]", options.sctpStreamParameters
+        )
         dataChannel = self.pc.createDataChannel(
             label=options.label,
             maxPacketLifeTime=options.sctpStreamParameters.maxPacketLifeTime,
@@ -585,33 +699,34 @@ class AiortcHandler(HandlerInterface):
             id=options.sctpStreamParameters.streamId,
         )
 
-        # If this is the first DataChannel we need to create the SDP offer with
-        # m=application section.
-        if not self._hasDataChannelMediaSection:
-            self.remoteSdp.receiveSctpAssociation()
-            offer: RTCSessionDescription = RTCSessionDescription(
-                type="offer", sdp=self.remoteSdp.getSdp()
-            )
-            logger.debug(
-                f"receiveDataChannel() | calling pc.setRemoteDescription() [offer:{offer}]"
-            )
-            await self.pc.setRemoteDescription(offer)
-            answer = await self.pc.createAnswer()
-            if not self._transportReady:
-                localSdpDict = sdp_transform.parse(answer.sdp)
-                await self._setupTransport(
-                    localDtlsRole="client", localSdpDict=localSdpDict
+        async with self._getRecvNegotiationLock():
+            # If this is the first DataChannel we need to create the SDP offer with
+            # m=application section.
+            if not self._hasDataChannelMediaSection:
+                self.remoteSdp.receiveSctpAssociation()
+                offer: RTCSessionDescription = RTCSessionDescription(
+                    type="offer", sdp=self.remoteSdp.getSdp()
                 )
-            logger.debug(
-                f"receiveDataChannel() | calling pc.setRemoteDescription() [answer:{answer}]"
-            )
-            await self.pc.setLocalDescription(answer)
-            self._hasDataChannelMediaSection = True
+                logger.debug(
+                    "receiveDataChannel() | calling pc.setRemoteDescription() [offer:%s]",
+                    offer,
+                )
+                await self.pc.setRemoteDescription(offer)
+                answer = await self.pc.createAnswer()
+                if not self._transportReady:
+                    localSdpDict = sdp_transform.parse(answer.sdp)
+                    await self._setupTransport(
+                        localDtlsRole="client", localSdpDict=localSdpDict
+                    )
+                logger.debug(
+                    "receiveDataChannel() | calling pc.setRemoteDescription() [answer:%s]",
+                    answer,
+                )
+                await self.pc.setLocalDescription(answer)
+                self._hasDataChannelMediaSection = True
         return HandlerReceiveDataChannelResult(dataChannel=dataChannel)
 
-    async def _setupTransport(self, localDtlsRole: DtlsRole, localSdpDict: dict = {}):
-        if localSdpDict == {}:
-            localSdpDict = sdp_transform.parse(self.pc.localDescription.sdp)
+    async def _setupTransport(self, localDtlsRole: DtlsRole, localSdpDict: dict):
         # Get our local DTLS parameters.
         dtlsParameters: DtlsParameters = extractDtlsParameters(localSdpDict)
         # Set our DTLS role.
@@ -624,6 +739,19 @@ class AiortcHandler(HandlerInterface):
         await self.emit_for_results("@connect", dtlsParameters)
         self._transportReady = True
 
+    # ICE "connected" and "completed" both map to "connected", so only emit
+    # when the mapped state changes.
+    def _emitConnectionState(self, connectionState: str):
+        if connectionState == self._connectionState:
+            return
+        self._connectionState = connectionState
+        self.emit("@connectionstatechange", connectionState)
+
+    def _getRecvNegotiationLock(self) -> asyncio.Lock:
+        if self._recvNegotiationLock is None:
+            self._recvNegotiationLock = asyncio.Lock()
+        return self._recvNegotiationLock
+
     def _assertSendDirection(self):
         if self._direction != "send":
             raise Exception(
@@ -122,7 +122,7 @@ class RemoteSdp:
         reuseMid: Optional[str] = None,
         extmapAllowMixed=False,
     ):
-        logger.debug(f"remoteSdp | send() offerMediaDict {offerMediaDict}")
+        logger.debug("remoteSdp | send() offerMediaDict %s", offerMediaDict)
         mediaSection = AnswerMediaSection(
             sctpParameters=self._sctpParameters,
             iceParameters=self._iceParameters,
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from .rtp_parameters import (
     RtpCodec,
     RtcpFeedback,
@@ -391,6 +391,34 @@ def getSendingRemoteRtpParameters(
     return rtpParameters
 
 
+# Generic sending RTP parameters for audio and video. Computed once per
+# ExtendedRtpCapabilities and shared by all its sending handlers, which must
+# copy them before any change.
+def getSendingRtpParametersByKind(
+    extendedRtpCapabilities: ExtendedRtpCapabilities,
+) -> Dict[str, RtpParameters]:
+    byKind = extendedRtpCapabilities._sendingRtpParametersByKind
+    if not byKind:
+        byKind["audio"] = getSendingRtpParameters("audio", extendedRtpCapabilities)
+        byKind["video"] = getSendingRtpParameters("video", extendedRtpCapabilities)
+    return byKind
+
+
+# Same as getSendingRtpParametersByKind() but suitable for the remote SDP answer.
+def getSendingRemoteRtpParametersByKind(
+    extendedRtpCapabilities: ExtendedRtpCapabilities,
+) -> Dict[str, RtpParameters]:
+    byKind = extendedRtpCapabilities._sendingRemoteRtpParametersByKind
+    if not byKind:
+        byKind["audio"] = getSendingRemoteRtpParameters(
+            "audio", extendedRtpCapabilities
+        )
+        byKind["video"] = getSendingRemoteRtpParameters(
+            "video", extendedRtpCapabilities
+        )
+    return byKind
+
+
 # Reduce given codecs by returning an array of codecs "compatible" with the
 # given capability codec. If no capability codec is given, take the first
 # one(s).
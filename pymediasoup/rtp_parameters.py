@@ -1,6 +1,6 @@
-from typing import Optional, List, Literal
+from typing import Dict, Optional, List, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 
 # Media kind ('audio' or 'video').
@@ -231,3 +231,13 @@ class RtpParameters(BaseModel):
 class ExtendedRtpCapabilities(BaseModel):
     codecs: List[ExtendedCodec] = []
     headerExtensions: List[ExtendedHeaderExtension] = []
+    # Generic sending RTP parameters by kind, filled on first use by
+    # ortc.getSendingRtpParametersByKind(). Shallow copies made by pydantic
+    # validation share these dicts, so every sending Transport of a Device
+    # reuses them.
+    _sendingRtpParametersByKind: Dict[str, RtpParameters] = PrivateAttr(
+        default_factory=dict
+    )
+    _sendingRemoteRtpParametersByKind: Dict[str, RtpParameters] = PrivateAttr(
+        default_factory=dict
+    )
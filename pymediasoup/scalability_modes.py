@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from pydantic import BaseModel
 
 
@@ -6,12 +7,17 @@ class ScalabilityMode(BaseModel):
     spatialLayers: int
     temporalLayers: int
 
+    class Config:
+        # parse() returns cached instances.
+        allow_mutation = False
 
-reg = r"^[LS]([1-9]\\d{0,1})T([1-9]\\d{0,1})"
 
+reg = re.compile(r"^[LS]([1-9]\d{0,1})T([1-9]\d{0,1})")
 
+
+@lru_cache(maxsize=64)
 def parse(scalabilityMode: str) -> ScalabilityMode:
-    match = re.match(reg, scalabilityMode)
+    match = reg.match(scalabilityMode)
     if match:
         return ScalabilityMode(
             spatialLayers=int(match[1]), temporalLayers=int(match[2])
@@ -350,7 +350,7 @@ class Transport(EnhancedEventEmitter):
         maxRetransmits: Optional[int] = None,
         label: Optional[str] = None,
         protocol: Optional[str] = None,
-        appData: Optional[dict] = {},
+        appData: Optional[dict] = None,
     ) -> DataProducer:
         options: DataProducerOptions = DataProducerOptions(
             ordered=ordered,
@@ -358,7 +358,7 @@ class Transport(EnhancedEventEmitter):
             maxRetransmits=maxRetransmits,
             label=label,
             protocol=protocol,
-            appData=appData,
+            appData={} if appData is None else appData,
         )
         logger.debug("Transport produceData()")
         if self._direction != "send":
@@ -415,18 +415,24 @@ class Transport(EnhancedEventEmitter):
         self,
         id: str,
         dataProducerId: str,
-        sctpStreamParameters: SctpStreamParameters,
+        sctpStreamParameters: Union[SctpStreamParameters, dict],
         label: Optional[str] = None,
         protocol: Optional[str] = None,
-        appData: Optional[dict] = {},
+        appData: Optional[dict] = None,
     ) -> DataConsumer:
+
+        if isinstance(sctpStreamParameters, dict):
+            sctpStreamParameters: SctpStreamParameters = SctpStreamParameters(
+                **sctpStreamParameters
+            )
+
         options: DataConsumerOptions = DataConsumerOptions(
             id=id,
             dataProducerId=dataProducerId,
             sctpStreamParameters=sctpStreamParameters,
             label=label,
             protocol=protocol,
-            appData=appData,
+            appData={} if appData is None else appData,
         )
         logger.debug("Transport consumeData()")
         if self._closed:
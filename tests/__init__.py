@@ -1,6 +1,8 @@
+import asyncio
+import copy
 import logging
 import unittest
-from aiortc import VideoStreamTrack
+from aiortc import RTCPeerConnection, VideoStreamTrack
 from aiortc.mediastreams import AudioStreamTrack
 
 from pymediasoup import Device
@@ -12,8 +14,10 @@ from pymediasoup.models.transport import DtlsParameters
 from pymediasoup.producer import Producer
 from pymediasoup.data_producer import DataProducer
 from pymediasoup.data_consumer import DataConsumer
-from pymediasoup.errors import UnsupportedError
+from pymediasoup.errors import InvalidStateError, UnsupportedError
 from pymediasoup.consumer import Consumer
+from pymediasoup.emitter import EnhancedEventEmitter
+from pymediasoup.scalability_modes import parse as smParse
 
 from .fake_parameters import (
     generateRouterRtpCapabilities,
@@ -42,6 +46,58 @@ class TestMethods(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(device.handlerName, "aiortc")
         self.assertTrue(device.loaded)
 
+    async def test_handler_warm_up(self):
+        await AiortcHandler.warmUp()
+        handler = AiortcHandler()
+        first = await handler.getNativeRtpCapabilities()
+        second = await handler.getNativeRtpCapabilities()
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+
+    def test_scalability_mode_parse(self):
+        layers = smParse("L3T2_KEY")
+        self.assertEqual(layers.spatialLayers, 3)
+        self.assertEqual(layers.temporalLayers, 2)
+        self.assertIs(smParse("L3T2_KEY"), layers)
+        self.assertEqual(smParse("").spatialLayers, 1)
+
+    async def test_send_transports_share_sending_parameters(self):
+        device = Device(handlerFactory=FakeHandler.createFactory(tracks=TRACKS))
+        await device.load(generateRouterRtpCapabilities())
+        handlers = []
+        for _ in range(2):
+            id, iceParameters, iceCandidates, dtlsParameters, sctpParameters = (
+                generateTransportRemoteParameters()
+            )
+            sendTransport = device.createSendTransport(
+                id=id,
+                iceParameters=iceParameters,
+                iceCandidates=iceCandidates,
+                dtlsParameters=dtlsParameters,
+                sctpParameters=sctpParameters,
+            )
+            handlers.append(sendTransport.handler)
+
+        for kind in ("audio", "video"):
+            self.assertIs(
+                handlers[0]._sendingRtpParametersByKind[kind],
+                handlers[1]._sendingRtpParametersByKind[kind],
+            )
+            self.assertIs(
+                handlers[0]._sendingRemoteRtpParametersByKind[kind],
+                handlers[1]._sendingRemoteRtpParametersByKind[kind],
+            )
+
+        for handler in handlers:
+            await handler.close()
+
+    async def test_device_load_keeps_router_capabilities(self):
+        device = Device(handlerFactory=AiortcHandler.createFactory(tracks=TRACKS))
+        routerRtpCapabilities = generateRouterRtpCapabilities()
+        expected = routerRtpCapabilities.dict()
+        await device.load(routerRtpCapabilities)
+        self.assertEqual(routerRtpCapabilities.dict(), expected)
+
     async def test_device_rtp_capabilities(self):
         device = Device(handlerFactory=AiortcHandler.createFactory(tracks=TRACKS))
         await device.load(generateRouterRtpCapabilities())
@@ -585,6 +641,23 @@ class TestMethods(unittest.IsolatedAsyncioTestCase):
 
         self.assertDictEqual(videoConsumer.appData, {})
 
+        # Consumers closed together share a single renegotiation.
+        pc = recvTransport.handler.pc
+        setRemoteDescription = pc.setRemoteDescription
+        offers = []
+
+        async def countingSetRemoteDescription(description):
+            offers.append(description)
+            await setRemoteDescription(description)
+
+        pc.setRemoteDescription = countingSetRemoteDescription
+        await asyncio.gather(audioConsumer.close(), videoConsumer.close())
+        pc.setRemoteDescription = setRemoteDescription
+
+        self.assertTrue(audioConsumer.closed)
+        self.assertTrue(videoConsumer.closed)
+        self.assertEqual(len(offers), 1)
+
         recvTransport.remove_all_listeners("connect")
 
         id, dataProducerId, sctpStreamParameters = (
@@ -604,3 +677,185 @@ class TestMethods(unittest.IsolatedAsyncioTestCase):
         self.assertFalse(dataConsumer.closed)
         self.assertEqual(dataConsumer.label, "FOO")
         self.assertEqual(dataConsumer.protocol, "BAR")
+
+    async def test_stop_receiving_during_renegotiation(self):
+        device = Device(handlerFactory=FakeHandler.createFactory(tracks=TRACKS))
+        await device.load(generateRouterRtpCapabilities())
+        id, iceParameters, iceCandidates, dtlsParameters, sctpParameters = (
+            generateTransportRemoteParameters()
+        )
+        recvTransport = device.createRecvTransport(
+            id=id,
+            iceParameters=iceParameters,
+            iceCandidates=iceCandidates,
+            dtlsParameters=dtlsParameters,
+            sctpParameters=sctpParameters,
+        )
+
+        @recvTransport.on("connect")
+        async def on_connect(dtlsParameters):
+            pass
+
+        consumers = []
+        for codecMimeType in ("audio/opus", "video/VP8", "video/VP8", "video/VP8"):
+            remoteParameters = generateConsumerRemoteParameters(
+                codecMimeType=codecMimeType
+            )
+            consumers.append(
+                await recvTransport.consume(
+                    id=remoteParameters["id"],
+                    producerId=remoteParameters["producerId"],
+                    kind=remoteParameters["kind"],
+                    rtpParameters=remoteParameters["rtpParameters"],
+                )
+            )
+
+        # Track the offer/answer exchanges run by stopReceiving().
+        pc = recvTransport.handler.pc
+        setRemoteDescription = pc.setRemoteDescription
+        setLocalDescription = pc.setLocalDescription
+        started = asyncio.Event()
+        offers = []
+        running = 0
+        overlapped = False
+
+        async def trackingSetRemoteDescription(description):
+            nonlocal running, overlapped
+            offers.append(description)
+            running += 1
+            overlapped = overlapped or running > 1
+            started.set()
+            await asyncio.sleep(0.01)
+            await setRemoteDescription(description)
+
+        async def trackingSetLocalDescription(description):
+            nonlocal running
+            await setLocalDescription(description)
+            running -= 1
+
+        pc.setRemoteDescription = trackingSetRemoteDescription
+        pc.setLocalDescription = trackingSetLocalDescription
+
+        # The second close arrives while the first renegotiation is running.
+        firstClose = asyncio.ensure_future(consumers[1].close())
+        await started.wait()
+        await consumers[2].close()
+        await firstClose
+
+        self.assertFalse(overlapped)
+        self.assertEqual(len(offers), 2)
+        self.assertEqual(offers[-1].sdp.count("m=video 0 "), 2)
+        self.assertIsNone(recvTransport.handler._stopReceivingTask)
+
+        # restartIce() arrives while a stopReceiving() renegotiation is running.
+        started.clear()
+        thirdClose = asyncio.ensure_future(consumers[3].close())
+        await started.wait()
+        await recvTransport.restartIce(iceParameters)
+        await thirdClose
+
+        self.assertFalse(overlapped)
+        self.assertEqual(len(offers), 4)
+
+        await recvTransport.close()
+
+    async def test_consumer_pause_resume(self):
+        consumer = Consumer(
+            id="consumer",
+            localId="0",
+            producerId="producer",
+            track=AudioStreamTrack(),
+            rtpParameters=RtpParameters(),
+        )
+        events = []
+        consumer.observer.on("pause", lambda: events.append("pause"))
+        consumer.observer.on("resume", lambda: events.append("resume"))
+
+        consumer.pause()
+        self.assertTrue(consumer.paused)
+        consumer.resume()
+        self.assertFalse(consumer.paused)
+        self.assertEqual(events, ["pause", "resume"])
+
+    async def test_consumer_close_ended_track(self):
+        track = AudioStreamTrack()
+        consumer = Consumer(
+            id="consumer",
+            localId="0",
+            producerId="producer",
+            track=track,
+            rtpParameters=RtpParameters(),
+        )
+        track.stop()
+
+        consumer.transportClosed()
+        self.assertTrue(consumer.closed)
+        self.assertEqual(track.readyState, "ended")
+
+    async def test_data_producer_send_not_open(self):
+        pc = RTCPeerConnection()
+        dataProducer = DataProducer(
+            id="dataProducer",
+            dataChannel=pc.createDataChannel("FOO"),
+            sctpStreamParameters=SctpStreamParameters(streamId=0),
+        )
+
+        @dataProducer.on("@close")
+        async def on_close():
+            pass
+
+        with self.assertRaises(InvalidStateError):
+            dataProducer.send("hello")
+
+        await dataProducer.close()
+        with self.assertRaises(InvalidStateError):
+            dataProducer.sendBatch(["hello"])
+        with self.assertRaises(InvalidStateError):
+            await dataProducer.waitOpen()
+
+        await pc.close()
+
+    async def test_emitter_listener_changes(self):
+        emitter = EnhancedEventEmitter()
+        calls = []
+
+        def on_foo(value):
+            calls.append(("on", value))
+
+        emitter.on("foo", on_foo)
+        emitter.once("foo", lambda value: calls.append(("once", value)))
+        emitter.emit("foo", 1)
+        emitter.emit("foo", 2)
+        emitter.remove_listener("foo", on_foo)
+        self.assertFalse(emitter.emit("foo", 3))
+        emitter.on("foo", on_foo)
+        emitter.remove_all_listeners()
+        emitter.emit("foo", 4)
+
+        self.assertEqual(calls, [("on", 1), ("once", 1), ("on", 2)])
+        self.assertEqual(await emitter.emit_for_results("foo"), [])
+
+    async def test_copy_keeps_state(self):
+        consumer = Consumer(
+            id="consumer",
+            localId="0",
+            producerId="producer",
+            track=AudioStreamTrack(),
+            rtpParameters=RtpParameters(),
+        )
+        consumer.on("foo", lambda: None)
+        consumerCopy = copy.copy(consumer)
+        self.assertEqual(consumerCopy.id, "consumer")
+        self.assertFalse(consumerCopy.closed)
+        self.assertTrue(consumerCopy.emit("foo"))
+
+        pc = RTCPeerConnection()
+        dataProducer = DataProducer(
+            id="dataProducer",
+            dataChannel=pc.createDataChannel("FOO"),
+            sctpStreamParameters=SctpStreamParameters(streamId=0),
+        )
+        dataProducerCopy = copy.copy(dataProducer)
+        self.assertEqual(dataProducerCopy.id, "dataProducer")
+        self.assertEqual(dataProducerCopy.label, "FOO")
+        await pc.close()